@@ -15,6 +15,10 @@ class MealEntryInline(admin.TabularInline):
     extra = 1
     autocomplete_fields = ("food",)
 
+    def get_queryset(self, request):
+        # Each row's __str__ touches daily_log.person and food
+        return super().get_queryset(request).select_related("food", "daily_log__person")
+
 
 @admin.register(DailyMacroLog)
 class DailyMacroLogAdmin(admin.ModelAdmin):
@@ -30,6 +34,10 @@ class DailyMacroLogAdmin(admin.ModelAdmin):
     autocomplete_fields = ("person",)
     inlines = [MealEntryInline]
 
+    def get_queryset(self, request):
+        # Used by the change list and the change/delete views, which all show person
+        return super().get_queryset(request).select_related("person")
+
 
 @admin.register(MealEntry)
 class MealEntryAdmin(admin.ModelAdmin):
@@ -37,4 +45,5 @@ class MealEntryAdmin(admin.ModelAdmin):
     list_filter = ("meal_type", "daily_log__date", "daily_log__person")
     search_fields = ("food__name", "daily_log__person__name")
     autocomplete_fields = ("daily_log", "food")
+    list_select_related = ("daily_log__person", "food")
 
@@ -0,0 +1,15 @@
+"""
+Cache keys shared by the views that fill them and the signals that clear them.
+
+Kept apart from accounts.views so AppConfig.ready() can register the signals
+without importing the views (and numpy/scipy with them).
+"""
+
+# Supplement Food rows
+SUPPLEMENTS_CACHE_KEY = "calculate_servings:supplements"
+
+# Home page people list
+HOME_PEOPLE_CACHE_KEY = "home:people"
+
+# {% cache %} fragment name of the meal_log food pickers
+FOODS_LIST_FRAGMENT = "foods_list"
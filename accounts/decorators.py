@@ -0,0 +1,40 @@
+import functools
+import logging
+import time
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+
+def debug_db_queries(view):
+    """
+    Log how many SQL queries a view ran and how long they took.
+
+    Only active when DEBUG is on, since Django records queries only then.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not settings.DEBUG:
+            return view(request, *args, **kwargs)
+
+        # Slice rather than reset_queries() so outer query capture (tests) still works
+        first_query = len(connection.queries_log)
+        start = time.perf_counter()
+        response = view(request, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        queries = connection.queries[first_query:]
+        query_time = sum(float(query["time"]) for query in queries)
+        logger.debug(
+            "%s: %d queries (%.3fs in SQL, %.3fs total)",
+            view.__name__,
+            len(queries),
+            query_time,
+            elapsed,
+        )
+        return response
+
+    return wrapper
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-14 03:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_remove_mealitem_meal_remove_mealitem_food_mealentry_and_more'),
+        ('foods', '0002_remove_food_calories_per_serving_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dailymacrolog',
+            index=models.Index(fields=['date'], name='accounts_da_date_6fa0b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mealentry',
+            index=models.Index(fields=['daily_log', 'meal_type'], name='accounts_me_daily_l_cffab9_idx'),
+        ),
+    ]
@@ -126,6 +126,8 @@ class DailyMacroLog(models.Model):
     class Meta:
         ordering = ["-date", "person__name"]
         unique_together = ("person", "date")
+        # (person, date) is already covered by the unique_together index
+        indexes = [models.Index(fields=["date"])]
 
     def __str__(self) -> str:
         return f"{self.person.name} - {self.date}"
@@ -200,6 +202,7 @@ class MealEntry(models.Model):
 
     class Meta:
         ordering = ["daily_log__date", "meal_type", "id"]
+        indexes = [models.Index(fields=["daily_log", "meal_type"])]
 
     def __str__(self) -> str:
         return f"{self.daily_log.person.name} - {self.daily_log.date} - {self.meal_type} - {self.food.name} x {self.servings}"
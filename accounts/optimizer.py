@@ -0,0 +1,152 @@
+"""
+Numerical side of calculate_servings.
+
+Everything here works on plain float arrays and carries no request state, so
+a solve can run wherever it is called from - the view today, or a background
+worker if solves ever get slow enough to need one.
+"""
+
+from functools import lru_cache
+
+try:
+    import numpy as np
+    from scipy.optimize import linprog, nnls
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+class OptimizationError(Exception):
+    """
+    Raised when no servings can meet the dinner targets.
+    """
+
+
+def macro_matrix(foods):
+    """
+    Return a float64 array of shape (len(foods), 3): protein, carbs and fats per serving.
+    """
+    return np.fromiter(
+        (
+            float(value)
+            for food in foods
+            for value in (food.protein_g_per_serving, food.carbs_g_per_serving, food.fats_g_per_serving)
+        ),
+        dtype=np.float64,
+        count=3 * len(foods),
+    ).reshape(-1, 3)
+
+
+def contributions(servings, macros):
+    """
+    Return the (n, 3) protein/carbs/fats each food contributes at the given servings.
+    """
+    return np.asarray(servings, dtype=np.float64)[:, None] * macros
+
+
+def meal_totals(rows, meal_sizes):
+    """
+    Sum per-food contribution rows into one (protein, carbs, fats) row per meal.
+
+    Rows are grouped in order: the first meal_sizes[0] rows belong to meal 0,
+    the next meal_sizes[1] to meal 1, and so on.
+    """
+    meals = np.repeat(np.arange(len(meal_sizes)), meal_sizes)
+    totals = np.zeros((len(meal_sizes), 3))
+    np.add.at(totals, meals, rows)
+    return totals
+
+
+def solve_without_supplements(macros, target_protein, target_carbs, target_fats):
+    """
+    Try to hit the targets with the given foods alone, in closed form.
+
+    Solves the protein/fats equations directly and returns the servings if they
+    are non-negative, exact and within the carbs limit - with no supplements
+    that is already the optimum, so the LP can be skipped.
+    Returns None when the solver is needed.
+    """
+    A = macros[:, [0, 2]].T
+    b = np.array([target_protein, target_fats])
+
+    # The minimum-norm solution spreads servings across every selected food
+    servings = np.linalg.lstsq(A, b, rcond=None)[0]
+    if servings.min() < -1e-9:
+        # Otherwise take the best non-negative one, which is exact whenever
+        # these foods can reach both targets at all
+        servings = nnls(A, b)[0]
+    servings = np.clip(servings, 0.0, None)
+
+    if not np.allclose(A @ servings, b, atol=1e-6) or servings @ macros[:, 1] > target_carbs + 1e-6:
+        return None
+    return servings
+
+
+@lru_cache(maxsize=256)
+def lp_matrices(macros_bytes, supplement_indices):
+    """
+    Build the target-independent parts of the dinner LP: (cost, A_eq, A_ub).
+
+    Keyed on the raw bytes of the float64 macro matrix, so the same food
+    selection with different remaining targets reuses the arrays, and an edit
+    to a Food's macros simply produces a new key. The arrays are read-only
+    because they are shared between requests.
+    """
+    macros = np.frombuffer(macros_bytes, dtype=np.float64).reshape(-1, 3)
+
+    # Every constraint and the objective are linear in servings, so this is a
+    # linear program and can go straight to the compiled HiGHS solver.
+
+    # Objective: minimize supplement use
+    # Unit cost on supplements only: the LP keeps them at zero whenever the
+    # selected foods can meet the targets, so no large penalty is needed
+    cost = np.zeros(len(macros))
+    cost[list(supplement_indices)] = 1.0
+
+    # Protein and fats must equal targets exactly
+    A_eq = np.vstack([macros[:, 0], macros[:, 2]])
+
+    # Carbs must be <= target (keto limit - can be 0, but not more than target)
+    A_ub = macros[np.newaxis, :, 1].copy()
+
+    for array in (cost, A_eq, A_ub):
+        array.flags.writeable = False
+    return cost, A_eq, A_ub
+
+
+def solve_dinner(macros, supplement_indices, target_protein, target_carbs, target_fats):
+    """
+    Return servings for every row of macros that meet the dinner targets.
+
+    Protein and fats must match their targets exactly and carbs must stay at or
+    under theirs (keto limit). The rows at supplement_indices are only used when
+    the other foods can't get there on their own. Raises OptimizationError when
+    the targets can't be met.
+    """
+    supplement_mask = np.zeros(len(macros), dtype=bool)
+    supplement_mask[supplement_indices] = True
+
+    servings = solve_without_supplements(macros[~supplement_mask], target_protein, target_carbs, target_fats)
+    if servings is not None:
+        solution = np.zeros(len(macros))
+        solution[~supplement_mask] = servings
+        return solution
+
+    cost, A_eq, A_ub = lp_matrices(macros.tobytes(), tuple(supplement_indices))
+    b_eq = [target_protein, target_fats]
+    b_ub = [target_carbs]
+
+    result = linprog(
+        cost,
+        A_ub=A_ub,
+        b_ub=b_ub,
+        A_eq=A_eq,
+        b_eq=b_eq,
+        # Servings must be >= 0; a single pair applies to every variable
+        bounds=(0, None),
+        # Dual simplex: with only three constraint rows an interior-point start isn't worth it
+        method="highs-ds",
+    )
+    if not result.success:
+        raise OptimizationError(result.message)
+    return result.x
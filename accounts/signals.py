@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db.models import QuerySet, Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from foods.models import Food
+from .cache_keys import FOODS_LIST_FRAGMENT, HOME_PEOPLE_CACHE_KEY, SUPPLEMENTS_CACHE_KEY
+from .models import DailyMacroLog, MealEntry, Person
+
+
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+def clear_food_caches(sender, **kwargs):
+    """
+    Drop the cached supplement rows and food picker so the next request sees admin edits.
+    """
+    cache.delete_many([SUPPLEMENTS_CACHE_KEY, make_template_fragment_key(FOODS_LIST_FRAGMENT)])
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def clear_people_cache(sender, **kwargs):
+    """
+    Drop the cached home page people list.
+    """
+    cache.delete(HOME_PEOPLE_CACHE_KEY)
+
+
+@receiver(pre_save, sender=MealEntry)
+def cache_entry_macros(sender, instance, **kwargs):
+    """
+    Fill in the entry's cached macro totals from its food and servings.
+
+    Grams are only recalculated for a new entry, when its food or servings
+    change, or when they are missing; later edits to the Food do not rewrite
+    existing entries, so historical days stay as they were planned, and grams
+    typed in by hand survive unrelated edits.
+    Fixture loads (raw saves) keep the grams stored in the fixture.
+    """
+    if kwargs.get("raw"):
+        return
+
+    servings = Decimal(str(instance.servings))
+    stored = None
+    if instance.pk:
+        stored = MealEntry.objects.filter(pk=instance.pk).values_list("daily_log_id", "food_id", "servings").first()
+    if stored is not None:
+        # Remember the day this entry used to belong to, in case it was moved
+        instance._previous_daily_log_id, stored_food_id, stored_servings = stored
+
+    grams = (instance.protein_grams, instance.carbs_grams, instance.fats_grams)
+    if stored is None or stored_food_id != instance.food_id or stored_servings != servings or None in grams:
+        food = instance.food
+        instance.protein_grams = _grams(servings, food.protein_g_per_serving)
+        instance.carbs_grams = _grams(servings, food.carbs_g_per_serving)
+        instance.fats_grams = _grams(servings, food.fats_g_per_serving)
+
+
+@receiver(post_save, sender=MealEntry)
+@receiver(post_delete, sender=MealEntry)
+def update_daily_totals(sender, instance, **kwargs):
+    """
+    Keep DailyMacroLog.actual_*_grams equal to the sum of its entries' cached macros.
+
+    Fixture loads (raw saves) already carry the day's totals, and entries
+    cascading from a deleted DailyMacroLog or Person leave no day to update.
+    """
+    if kwargs.get("raw"):
+        return
+    origin = kwargs.get("origin")
+    if origin is not None:
+        origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+        if origin_model is not MealEntry:
+            return
+
+    daily_log_ids = {instance.daily_log_id, getattr(instance, "_previous_daily_log_id", None)}
+    daily_log_ids.discard(None)
+    for daily_log_id in daily_log_ids:
+        refresh_daily_totals(daily_log_id)
+
+
+def _grams(servings, grams_per_serving):
+    """
+    Return servings x a Food's (float) per-serving grams as a 2-place Decimal.
+    """
+    return (servings * Decimal(str(grams_per_serving))).quantize(Decimal("0.01"))
+
+
+def refresh_daily_totals(daily_log_id):
+    """
+    Recompute the actual macro totals of one DailyMacroLog from its entries.
+    """
+    totals = MealEntry.objects.filter(daily_log_id=daily_log_id).aggregate(
+        protein=Sum("protein_grams"),
+        carbs=Sum("carbs_grams"),
+        fats=Sum("fats_grams"),
+    )
+    for key, value in totals.items():
+        if value is not None:
+            totals[key] = value.quantize(Decimal("0.1"))
+
+    DailyMacroLog.objects.filter(pk=daily_log_id).update(
+        actual_protein_grams=totals["protein"],
+        actual_carbs_grams=totals["carbs"],
+        actual_fats_grams=totals["fats"],
+    )
@@ -0,0 +1,364 @@
+import datetime
+import json
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.core import serializers
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from foods.models import Food
+from .cache_keys import FOODS_LIST_FRAGMENT
+from .models import DailyMacroLog, MealEntry, Person
+from .optimizer import SCIPY_AVAILABLE, OptimizationError, solve_dinner
+from .views import get_supplements
+
+if SCIPY_AVAILABLE:
+    import numpy as np
+
+
+class DailyTotalsSignalTests(TestCase):
+    """
+    accounts.signals keeps the cached entry grams and DailyMacroLog.actual_* in sync.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.person = Person.objects.create(name="Ann")
+        cls.chicken = Food.objects.create(
+            name="Chicken", protein_g_per_serving=30.0, carbs_g_per_serving=0.0, fats_g_per_serving=5.0
+        )
+        cls.rice = Food.objects.create(
+            name="Rice", protein_g_per_serving=4.0, carbs_g_per_serving=45.0, fats_g_per_serving=0.5
+        )
+        cls.monday = DailyMacroLog.objects.create(person=cls.person, date=datetime.date(2024, 1, 1))
+        cls.tuesday = DailyMacroLog.objects.create(person=cls.person, date=datetime.date(2024, 1, 2))
+
+    def actual_totals(self, daily_log):
+        daily_log.refresh_from_db()
+        return (daily_log.actual_protein_grams, daily_log.actual_carbs_grams, daily_log.actual_fats_grams)
+
+    def test_create_caches_grams_and_totals(self):
+        entry = MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1.5"))
+        MealEntry.objects.create(daily_log=self.monday, food=self.rice, servings=Decimal("2"))
+
+        self.assertEqual(
+            (entry.protein_grams, entry.carbs_grams, entry.fats_grams),
+            (Decimal("45.00"), Decimal("0.00"), Decimal("7.50")),
+        )
+        self.assertEqual(self.actual_totals(self.monday), (Decimal("53.0"), Decimal("90.0"), Decimal("8.5")))
+
+    def test_resave_keeps_grams_after_food_edit(self):
+        entry = MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+        self.chicken.protein_g_per_serving = 25.0
+        self.chicken.save()
+
+        entry.notes = "Leftovers"
+        entry.save()
+
+        entry.refresh_from_db()
+        self.assertEqual(
+            (entry.protein_grams, entry.carbs_grams, entry.fats_grams),
+            (Decimal("30.00"), Decimal("0.00"), Decimal("5.00")),
+        )
+
+    def test_hand_entered_grams_survive_unrelated_edits(self):
+        entry = MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+
+        entry.protein_grams = Decimal("99")
+        entry.notes = "Weighed it"
+        entry.save()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.protein_grams, Decimal("99.00"))
+        self.assertEqual(self.actual_totals(self.monday), (Decimal("99.0"), Decimal("0.0"), Decimal("5.0")))
+
+    def test_servings_change_recalculates_grams(self):
+        entry = MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+
+        entry.servings = Decimal("2")
+        entry.save()
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.protein_grams, Decimal("60.00"))
+
+    def test_moving_entry_refreshes_both_days(self):
+        MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+        entry = MealEntry.objects.create(daily_log=self.monday, food=self.rice, servings=Decimal("1"))
+
+        entry.daily_log = self.tuesday
+        entry.save()
+
+        self.assertEqual(self.actual_totals(self.monday), (Decimal("30.0"), Decimal("0.0"), Decimal("5.0")))
+        self.assertEqual(self.actual_totals(self.tuesday), (Decimal("4.0"), Decimal("45.0"), Decimal("0.5")))
+
+    def test_delete_refreshes_totals(self):
+        entry = MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+        MealEntry.objects.create(daily_log=self.monday, food=self.rice, servings=Decimal("1"))
+
+        entry.delete()
+        self.assertEqual(self.actual_totals(self.monday), (Decimal("4.0"), Decimal("45.0"), Decimal("0.5")))
+
+        MealEntry.objects.filter(daily_log=self.monday).delete()
+        self.assertEqual(self.actual_totals(self.monday), (None, None, None))
+
+    def test_cascade_delete_of_daily_log(self):
+        MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+        MealEntry.objects.create(daily_log=self.monday, food=self.rice, servings=Decimal("1"))
+        MealEntry.objects.create(daily_log=self.tuesday, food=self.rice, servings=Decimal("1"))
+
+        # The day is going away with its entries, so none of them refresh its totals
+        with CaptureQueriesContext(connection) as queries:
+            self.monday.delete()
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries.captured_queries))
+
+        self.assertFalse(MealEntry.objects.filter(daily_log_id=self.monday.pk).exists())
+        self.assertEqual(self.actual_totals(self.tuesday), (Decimal("4.0"), Decimal("45.0"), Decimal("0.5")))
+
+    def test_cascade_delete_of_person(self):
+        MealEntry.objects.create(daily_log=self.monday, food=self.chicken, servings=Decimal("1"))
+        MealEntry.objects.create(daily_log=self.tuesday, food=self.rice, servings=Decimal("1"))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.person.delete()
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries.captured_queries))
+
+        self.assertFalse(MealEntry.objects.exists())
+
+    def test_raw_save_keeps_fixture_grams(self):
+        fixture = serializers.serialize("json", [
+            MealEntry(
+                pk=1,
+                daily_log=self.monday,
+                food=self.chicken,
+                servings=Decimal("1"),
+                protein_grams=Decimal("28.00"),
+                carbs_grams=Decimal("0.00"),
+                fats_grams=Decimal("4.00"),
+            ),
+        ])
+        for obj in serializers.deserialize("json", fixture):
+            obj.save()
+
+        entry = MealEntry.objects.get(pk=1)
+        self.assertEqual((entry.protein_grams, entry.fats_grams), (Decimal("28.00"), Decimal("4.00")))
+        self.assertEqual(self.actual_totals(self.monday), (None, None, None))
+
+
+@skipUnless(SCIPY_AVAILABLE, "numpy and scipy are required for the dinner solver")
+class SolveDinnerTests(SimpleTestCase):
+    """
+    solve_dinner() takes each path - closed form, nnls, LP - and fails loudly when infeasible.
+    """
+
+    # Protein powder and heavy cream, last two rows as in calculate_servings
+    SUPPLEMENTS = [(25.0, 3.0, 1.0), (1.0, 1.0, 11.0)]
+
+    def solve(self, foods, protein, carbs, fats):
+        macros = np.array(foods + self.SUPPLEMENTS, dtype=np.float64)
+        supplement_indices = [len(foods), len(foods) + 1]
+        return macros, solve_dinner(macros, supplement_indices, protein, carbs, fats)
+
+    def assertMeetsTargets(self, macros, servings, protein, carbs, fats):
+        self.assertTrue((servings >= -1e-9).all(), servings)
+        got_protein, got_carbs, got_fats = servings @ macros
+        self.assertAlmostEqual(got_protein, protein, places=6)
+        self.assertAlmostEqual(got_fats, fats, places=6)
+        self.assertLessEqual(got_carbs, carbs + 1e-6)
+
+    def test_exact_fast_path_uses_no_supplements(self):
+        # 2 chicken + 2 avocado is the only way to hit protein and fats exactly
+        macros, servings = self.solve([(30.0, 0.0, 5.0), (2.0, 9.0, 15.0)], 64.0, 50.0, 40.0)
+
+        np.testing.assert_allclose(servings, [2.0, 2.0, 0.0, 0.0], atol=1e-9)
+        self.assertMeetsTargets(macros, servings, 64.0, 50.0, 40.0)
+
+    def test_nnls_when_min_norm_solution_is_negative(self):
+        foods = [(30.0, 0.0, 5.0), (2.0, 9.0, 15.0), (10.0, 0.0, 20.0)]
+        # Precondition: the minimum-norm solution needs a negative serving here
+        self.assertLess(np.linalg.lstsq(np.array(foods)[:, [0, 2]].T, [60.0, 10.0], rcond=None)[0].min(), 0)
+
+        macros, servings = self.solve(foods, 60.0, 50.0, 10.0)
+
+        np.testing.assert_allclose(servings, [2.0, 0.0, 0.0, 0.0, 0.0], atol=1e-9)
+        self.assertMeetsTargets(macros, servings, 60.0, 50.0, 10.0)
+
+    def test_lp_adds_supplements_when_foods_fall_short(self):
+        # Chicken alone can't reach 40 g fat alongside 60 g protein
+        macros, servings = self.solve([(30.0, 0.0, 5.0)], 60.0, 20.0, 40.0)
+
+        self.assertGreater(servings[1:].sum(), 0.0)
+        self.assertMeetsTargets(macros, servings, 60.0, 20.0, 40.0)
+
+    def test_infeasible_targets_raise(self):
+        # With no carbs allowed, neither supplement can be used, and chicken's
+        # protein-to-fat ratio can't match the targets
+        with self.assertRaises(OptimizationError):
+            self.solve([(30.0, 0.0, 5.0)], 10.0, 0.0, 100.0)
+
+
+@skipUnless(SCIPY_AVAILABLE, "numpy and scipy are required for the dinner solver")
+class CalculateServingsViewTests(TestCase):
+    """
+    calculate_servings answers malformed payloads with a JSON error, never a 500.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.person = Person.objects.create(
+            name="Ann", protein_grams=Decimal("150"), carbs_grams=Decimal("50"), fats_grams=Decimal("120")
+        )
+        cls.chicken = Food.objects.create(
+            name="Chicken", protein_g_per_serving=30.0, carbs_g_per_serving=0.0, fats_g_per_serving=5.0
+        )
+
+    def setUp(self):
+        # Solutions and supplement rows are cached across requests
+        cache.clear()
+
+    def post(self, body, person_name="ann"):
+        if not isinstance(body, (str, bytes)):
+            body = json.dumps(body)
+        return self.client.post(
+            reverse("calculate_servings", args=[person_name]), body, content_type="application/json"
+        )
+
+    def assertError(self, response, message):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"error": message})
+
+    def test_invalid_bodies(self):
+        for body in ("not json", "[1, 2]", "5"):
+            with self.subTest(body=body):
+                # Only the person lookup runs before the body is rejected
+                with self.assertNumQueries(1):
+                    response = self.post(body)
+                self.assertError(response, "Invalid JSON data")
+
+    def test_missing_or_malformed_dinner(self):
+        for dinner in (None, [], 5, "abc", {"a": 1}, ["1"]):
+            with self.subTest(dinner=dinner):
+                body = {"breakfast": [{"food_id": self.chicken.id, "servings": 1}], "lunch": []}
+                if dinner is not None:
+                    body["dinner"] = dinner
+                # No Food query (supplements or selection) before the dinner check
+                with self.assertNumQueries(1):
+                    response = self.post(body)
+                self.assertError(response, "Please select at least one food for dinner.")
+
+    def test_non_list_breakfast_and_lunch_are_ignored(self):
+        for body in (
+            {"breakfast": "abc", "lunch": [], "dinner": [self.chicken.id]},
+            {"breakfast": {"a": 1}, "lunch": [], "dinner": [self.chicken.id]},
+            {"breakfast": "abc", "dinner": [self.chicken.id]},
+            {"breakfast": [], "lunch": 5, "dinner": [self.chicken.id]},
+        ):
+            with self.subTest(body=body):
+                results = self.post(body).json()
+                self.assertNotIn("error", results)
+                self.assertEqual((results["breakfast"], results["lunch"]), ([], []))
+                self.assertEqual([food["food_id"] for food in results["dinner"]], [self.chicken.id])
+
+    def test_out_of_range_food_ids_are_ignored(self):
+        results = self.post({
+            "breakfast": [{"food_id": 1e29, "servings": 1}, {"food_id": 2 ** 63, "servings": 1}],
+            "lunch": [],
+            "dinner": [2 ** 63, self.chicken.id],
+        }).json()
+
+        self.assertNotIn("error", results)
+        self.assertEqual(results["breakfast"], [])
+        self.assertEqual([food["food_id"] for food in results["dinner"]], [self.chicken.id])
+
+    def test_breakfast_and_lunch_exceeding_a_target(self):
+        response = self.post({
+            "breakfast": [{"food_id": self.chicken.id, "servings": 4}],
+            "lunch": [{"food_id": self.chicken.id, "servings": 2}],
+            "dinner": [self.chicken.id],
+        })
+        self.assertError(response, "Breakfast and lunch already exceed the daily protein target.")
+
+    def test_float_rounding_is_not_an_exceeded_target(self):
+        # 0.1 + 0.2 g carbs sums to a hair over the 0.3 g goal in floats
+        Person.objects.create(
+            name="Tiny", protein_grams=Decimal("30"), carbs_grams=Decimal("0.3"), fats_grams=Decimal("5")
+        )
+        sugar = Food.objects.create(
+            name="Sugar", protein_g_per_serving=0.0, carbs_g_per_serving=0.1, fats_g_per_serving=0.0
+        )
+        honey = Food.objects.create(
+            name="Honey", protein_g_per_serving=0.0, carbs_g_per_serving=0.2, fats_g_per_serving=0.0
+        )
+
+        results = self.post(
+            {
+                "breakfast": [{"food_id": sugar.id, "servings": 1}],
+                "lunch": [{"food_id": honey.id, "servings": 1}],
+                "dinner": [self.chicken.id],
+            },
+            person_name="tiny",
+        ).json()
+
+        self.assertNotIn("error", results)
+        self.assertEqual(len(results["dinner"]), 1)
+        self.assertAlmostEqual(results["dinner"][0]["servings"], 1.0)
+        self.assertEqual(results["supplements"], [])
+
+    def test_unknown_dinner_foods(self):
+        self.assertError(self.post({"dinner": [self.chicken.id + 1000]}), "No valid foods selected for dinner.")
+
+
+class GetSupplementsTests(TestCase):
+    """
+    get_supplements() creates only the missing supplement rows and caches both.
+    """
+
+    fragment_key = make_template_fragment_key(FOODS_LIST_FRAGMENT)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_empty_database_creates_both(self):
+        cache.set(self.fragment_key, "<option>stale</option>")
+
+        protein_powder, heavy_cream = get_supplements()
+
+        self.assertEqual((protein_powder.name, heavy_cream.name), ("Protein Powder", "Heavy Cream"))
+        self.assertEqual((protein_powder.protein_g_per_serving, heavy_cream.fats_g_per_serving), (25.0, 11.0))
+        self.assertIsNotNone(protein_powder.pk)
+        self.assertIsNotNone(heavy_cream.pk)
+        self.assertEqual(Food.objects.count(), 2)
+        # bulk_create sends no post_save, so get_supplements drops the pickers itself
+        self.assertIsNone(cache.get(self.fragment_key))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_supplements(), (protein_powder, heavy_cream))
+
+    def test_only_missing_supplement_is_created(self):
+        existing = Food.objects.create(
+            name="Protein Powder", protein_g_per_serving=24.0, carbs_g_per_serving=2.0, fats_g_per_serving=2.0
+        )
+        cache.set(self.fragment_key, "<option>stale</option>")
+
+        protein_powder, heavy_cream = get_supplements()
+
+        self.assertEqual(protein_powder.pk, existing.pk)
+        self.assertEqual(protein_powder.protein_g_per_serving, 24.0)
+        self.assertEqual(heavy_cream.name, "Heavy Cream")
+        self.assertEqual(
+            list(Food.objects.values_list("name", flat=True).order_by("name")), ["Heavy Cream", "Protein Powder"]
+        )
+        self.assertIsNone(cache.get(self.fragment_key))
+
+    def test_existing_supplements_are_read_in_one_query(self):
+        for name in ("Protein Powder", "Heavy Cream"):
+            Food.objects.create(name=name, protein_g_per_serving=1.0, carbs_g_per_serving=1.0, fats_g_per_serving=1.0)
+        cache.set(self.fragment_key, "<option>fresh</option>")
+
+        with self.assertNumQueries(1):
+            get_supplements()
+        self.assertEqual(cache.get(self.fragment_key), "<option>fresh</option>")
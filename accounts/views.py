@@ -1,146 +1,272 @@
+import hashlib
 import json
-from decimal import Decimal
 
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from foods.models import Food
+from .cache_keys import FOODS_LIST_FRAGMENT, HOME_PEOPLE_CACHE_KEY, SUPPLEMENTS_CACHE_KEY
+from .decorators import debug_db_queries
 from .models import Person
+from .optimizer import (
+    SCIPY_AVAILABLE,
+    OptimizationError,
+    contributions,
+    macro_matrix,
+    meal_totals,
+    solve_dinner,
+)
 
 try:
-    from scipy.optimize import minimize
-    SCIPY_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    SCIPY_AVAILABLE = False
+    ORJSON_AVAILABLE = False
 
 
+class OrjsonResponse(HttpResponse):
+    """
+    A JsonResponse stand-in that serializes with orjson (numpy scalars included).
+    """
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY), **kwargs)
+
+
+# calculate_servings answers through orjson when it is installed
+ServingsResponse = OrjsonResponse if ORJSON_AVAILABLE else JsonResponse
+
+# How long (seconds) a solved dinner is reused for an identical request
+SOLUTION_CACHE_TIMEOUT = 60 * 60
+
+# Food columns calculate_servings reads (macros and what the results show)
+SOLVER_FOOD_FIELDS = (
+    "id",
+    "name",
+    "serving_name",
+    "protein_g_per_serving",
+    "carbs_g_per_serving",
+    "fats_g_per_serving",
+)
+
+# Largest Food primary key (BigAutoField); bigger ids overflow the database lookup
+MAX_FOOD_ID = 2 ** 63 - 1
+
+# Supplement Food rows, invalidated by accounts.signals
+SUPPLEMENTS_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Cached page data that only changes through admin edits (see accounts.signals)
+PAGE_CACHE_TIMEOUT = 5 * 60
+
+# Supplements the dinner solver may add, with the defaults used to create them
+SUPPLEMENT_DEFAULTS = {
+    "Protein Powder": {
+        "category": "protein",
+        "protein_g_per_serving": 25.0,
+        "carbs_g_per_serving": 3.0,
+        "fats_g_per_serving": 1.0,
+        "serving_name": "1 scoop",
+        "is_recipe": False,
+    },
+    "Heavy Cream": {
+        "category": "fat",
+        "protein_g_per_serving": 1.0,
+        "carbs_g_per_serving": 1.0,
+        "fats_g_per_serving": 11.0,
+        "serving_name": "1 oz (about 2 tbsp)",
+        "is_recipe": False,
+    },
+}
+
+
+def get_supplements():
+    """
+    Return the (protein powder, heavy cream) Food rows, creating them if missing.
+
+    These rows are effectively constants, so they are kept in Django's cache -
+    shared by every worker when a shared backend is configured. accounts.signals
+    deletes the key whenever a Food is saved or deleted.
+    """
+    supplements = cache.get(SUPPLEMENTS_CACHE_KEY)
+    if supplements is not None:
+        return supplements
+
+    # One query for both rows; create whichever are missing in one more
+    names = list(SUPPLEMENT_DEFAULTS)
+    existing = Food.objects.in_bulk(names, field_name="name")
+    missing = [Food(name=name, **SUPPLEMENT_DEFAULTS[name]) for name in names if name not in existing]
+    if missing:
+        # name is unique, so a concurrent request creating the same row is no error.
+        # bulk_create skips post_save, so drop the cached food pickers here instead
+        Food.objects.bulk_create(missing, ignore_conflicts=True)
+        cache.delete(make_template_fragment_key(FOODS_LIST_FRAGMENT))
+        existing = Food.objects.in_bulk(names, field_name="name")
+
+    protein_powder, heavy_cream = existing["Protein Powder"], existing["Heavy Cream"]
+    supplements = (protein_powder, heavy_cream)
+    cache.set(SUPPLEMENTS_CACHE_KEY, supplements, SUPPLEMENTS_CACHE_TIMEOUT)
+    return supplements
+
+
+def format_meal(foods_servings, rows):
+    """
+    Build the result entries for one meal from (food, servings) pairs and their macro rows.
+
+    Servings are expected as Python floats already (parsed input or a solution's tolist()).
+    """
+    return [
+        {
+            "food_id": food.id,
+            "food_name": food.name,
+            "servings": servings,
+            "serving_name": food.serving_name or "serving",
+            "protein": protein,
+            "carbs": carbs,
+            "fats": fats,
+        }
+        for (food, servings), (protein, carbs, fats) in zip(foods_servings, rows)
+    ]
+
+
+@debug_db_queries
 def home(request):
     """
     Very simple home page: list all people and their daily macro requirements.
     """
-    people = Person.objects.all().order_by("name")
+    # The template only reads these fields, so skip model instantiation entirely.
+    # People are only edited in the admin; accounts.signals drops this key when they are.
+    people = cache.get_or_set(
+        HOME_PEOPLE_CACHE_KEY,
+        lambda: list(Person.objects.values("name", "protein_grams", "carbs_grams", "fats_grams").order_by("name")),
+        PAGE_CACHE_TIMEOUT,
+    )
     return render(request, "accounts/home.html", {"people": people})
 
 
+@debug_db_queries
 def meal_log(request, person_name):
     """
     Meal logging page for a specific person.
     Shows interactive food selection for Breakfast, Lunch, and Dinner.
     """
     person = get_object_or_404(Person, name__iexact=person_name)
-    foods = Food.objects.filter(is_active=True).order_by("name")
-    return render(request, "accounts/meal_log.html", {"person": person, "foods": foods})
+    # The food pickers only render id and name, so skip model instantiation; the
+    # queryset stays lazy so a foods_list fragment cache hit never runs it
+    foods = Food.objects.filter(is_active=True).values("id", "name").order_by("name")
+    return render(
+        request,
+        "accounts/meal_log.html",
+        {"person": person, "foods": foods, "foods_cache_timeout": PAGE_CACHE_TIMEOUT},
+    )
 
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@debug_db_queries
 def calculate_servings(request, person_name):
     """
     Calculate optimal servings for selected foods to meet macro goals.
     Uses optimization to balance macros across meals and allows supplementation.
     """
     if not SCIPY_AVAILABLE:
-        return JsonResponse({"error": "scipy is required for serving calculations. Install it with: pip install scipy"})
+        return ServingsResponse({"error": "scipy is required for serving calculations. Install it with: pip install scipy"})
 
     person = get_object_or_404(Person, name__iexact=person_name)
     
     # Check if person has macro targets
     if not person.protein_grams or not person.carbs_grams or not person.fats_grams:
-        return JsonResponse({"error": "Person must have protein, carbs, and fats targets set."})
+        return ServingsResponse({"error": "Person must have protein, carbs, and fats targets set."})
 
     try:
-        data = json.loads(request.body)
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except covers both
+        data = orjson.loads(request.body) if ORJSON_AVAILABLE else json.loads(request.body)
     except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON data"})
-
-    # Get or create protein powder and heavy cream
-    protein_powder, _ = Food.objects.get_or_create(
-        name="Protein Powder",
-        defaults={
-            "category": "protein",
-            "protein_g_per_serving": Decimal("25.0"),
-            "carbs_g_per_serving": Decimal("3.0"),
-            "fats_g_per_serving": Decimal("1.0"),
-            "serving_name": "1 scoop",
-            "is_recipe": False,
-        }
-    )
-    
-    heavy_cream, _ = Food.objects.get_or_create(
-        name="Heavy Cream",
-        defaults={
-            "category": "fat",
-            "protein_g_per_serving": Decimal("1.0"),
-            "carbs_g_per_serving": Decimal("1.0"),
-            "fats_g_per_serving": Decimal("11.0"),
-            "serving_name": "1 oz (about 2 tbsp)",
-            "is_recipe": False,
-        }
-    )
+        return ServingsResponse({"error": "Invalid JSON data"})
+    if not isinstance(data, dict):
+        return ServingsResponse({"error": "Invalid JSON data"})
+
+    # Check every meal's shape before any database work. Dinner is just food IDs,
+    # and a missing or empty dinner leaves nothing to calculate
+    dinner = data.get("dinner")
+    dinner_food_ids = [food_id for food_id in dinner if isinstance(food_id, int)] if isinstance(dinner, list) else []
+    if not dinner_food_ids:
+        return ServingsResponse({"error": "Please select at least one food for dinner."})
 
-    # Collect breakfast/lunch foods with user-set servings, and dinner foods (to be calculated)
+    # Breakfast/lunch entries that aren't lists are ignored, like malformed items
+    meal_items = {}
+    for meal in ("breakfast", "lunch"):
+        items = data.get(meal)
+        meal_items[meal] = items if isinstance(items, list) else []
+
+    protein_powder, heavy_cream = get_supplements()
+
+    # Collect breakfast/lunch foods with user-set servings (dinner servings will be calculated)
     breakfast_foods_servings = []  # List of (food, servings) tuples
     lunch_foods_servings = []  # List of (food, servings) tuples
-    dinner_food_ids = []  # List of food IDs (servings will be calculated)
 
-    # Parse breakfast data (has food_id and servings)
-    for item in data.get("breakfast", []):
-        if isinstance(item, dict) and "food_id" in item and "servings" in item:
+    # Fetch every requested food in a single query instead of one get() per item
+    requested_ids = set(dinner_food_ids)
+    for item in meal_items["breakfast"] + meal_items["lunch"]:
+        if isinstance(item, dict) and "food_id" in item:
             try:
-                food = Food.objects.get(id=item["food_id"], is_active=True)
-                breakfast_foods_servings.append((food, float(item["servings"])))
-            except (Food.DoesNotExist, ValueError, KeyError):
+                requested_ids.add(int(item["food_id"]))
+            except (TypeError, ValueError, OverflowError):
                 continue
+    # Ids past the primary key range can't match a row
+    requested_ids = {food_id for food_id in requested_ids if 0 < food_id <= MAX_FOOD_ID}
+    foods_by_id = Food.objects.filter(is_active=True).only(*SOLVER_FOOD_FIELDS).in_bulk(requested_ids)
 
-    # Parse lunch data (has food_id and servings)
-    for item in data.get("lunch", []):
+    # Parse breakfast data (has food_id and servings)
+    for item in meal_items["breakfast"]:
         if isinstance(item, dict) and "food_id" in item and "servings" in item:
             try:
-                food = Food.objects.get(id=item["food_id"], is_active=True)
-                lunch_foods_servings.append((food, float(item["servings"])))
-            except (Food.DoesNotExist, ValueError, KeyError):
+                food = foods_by_id.get(int(item["food_id"]))
+                servings = float(item["servings"])
+            except (TypeError, ValueError, OverflowError):
                 continue
+            if food is not None:
+                breakfast_foods_servings.append((food, servings))
 
-    # Parse dinner data (just food IDs)
-    for food_id in data.get("dinner", []):
-        if isinstance(food_id, int):
+    # Parse lunch data (has food_id and servings)
+    for item in meal_items["lunch"]:
+        if isinstance(item, dict) and "food_id" in item and "servings" in item:
             try:
-                dinner_food_ids.append(food_id)
-            except (ValueError, TypeError):
+                food = foods_by_id.get(int(item["food_id"]))
+                servings = float(item["servings"])
+            except (TypeError, ValueError, OverflowError):
                 continue
+            if food is not None:
+                lunch_foods_servings.append((food, servings))
+
+    # Calculate consumed macros from breakfast and lunch in one pass over all logged foods
+    logged_foods_servings = breakfast_foods_servings + lunch_foods_servings
+    logged_contributions = contributions(
+        [servings for _, servings in logged_foods_servings],
+        macro_matrix([food for food, _ in logged_foods_servings]),
+    )
+    logged_totals = meal_totals(logged_contributions, [len(breakfast_foods_servings), len(lunch_foods_servings)])
+    consumed_protein, consumed_carbs, consumed_fats = logged_totals.sum(axis=0).tolist()
 
-    # Calculate consumed macros from breakfast and lunch
-    consumed_protein = 0.0
-    consumed_carbs = 0.0
-    consumed_fats = 0.0
-
-    for food, servings in breakfast_foods_servings + lunch_foods_servings:
-        consumed_protein += float(servings) * float(food.protein_g_per_serving)
-        consumed_carbs += float(servings) * float(food.carbs_g_per_serving)
-        consumed_fats += float(servings) * float(food.fats_g_per_serving)
+    # Daily targets as floats, converted once and reused below
+    goal_protein = float(person.protein_grams)
+    goal_carbs = float(person.carbs_grams)
+    goal_fats = float(person.fats_grams)
 
     # Calculate remaining targets for dinner
-    remaining_protein = float(person.protein_grams) - consumed_protein
-    remaining_carbs = float(person.carbs_grams) - consumed_carbs
-    remaining_fats = float(person.fats_grams) - consumed_fats
-
-    # Check if we need to calculate dinner
-    if not dinner_food_ids:
-        return JsonResponse({"error": "Please select at least one food for dinner."})
+    remaining_protein = goal_protein - consumed_protein
+    remaining_carbs = goal_carbs - consumed_carbs
+    remaining_fats = goal_fats - consumed_fats
 
     # Get dinner foods
-    dinner_foods = []
-    for food_id in dinner_food_ids:
-        try:
-            food = Food.objects.get(id=food_id, is_active=True)
-            dinner_foods.append(food)
-        except Food.DoesNotExist:
-            continue
+    dinner_foods = [foods_by_id[food_id] for food_id in dinner_food_ids if food_id in foods_by_id]
 
     if not dinner_foods:
-        return JsonResponse({"error": "No valid foods selected for dinner."})
+        return ServingsResponse({"error": "No valid foods selected for dinner."})
 
     # Build optimization problem - only for dinner
     all_foods = dinner_foods.copy()
@@ -153,67 +279,50 @@ def calculate_servings(request, person_name):
     all_foods.append(heavy_cream)
 
     if len(all_foods) == 2:  # Only supplements
-        return JsonResponse({"error": "Please select at least one food for at least one meal."})
+        return ServingsResponse({"error": "Please select at least one food for at least one meal."})
 
     # Target macros (remaining after breakfast and lunch)
     target_protein = remaining_protein
     target_carbs = remaining_carbs
     target_fats = remaining_fats
 
-    # Objective: minimize supplement use (dinner is the only meal being optimized)
-    def objective(servings):
-        # Penalize supplement use - this ensures supplements are only used when necessary
-        # Large penalty (1000) to strongly discourage supplement use unless needed
-        supplement_penalty = 1000.0 * (servings[protein_powder_idx] + servings[heavy_cream_idx])
-        return supplement_penalty
-
-    # Constraints: protein and fats must equal targets exactly, carbs must be <= target (keto limit)
-    def constraint_protein(servings):
-        total = 0.0
-        for i, food in enumerate(all_foods):
-            total += servings[i] * float(food.protein_g_per_serving)
-        return total - target_protein
-
-    def constraint_carbs_max(servings):
-        # Carbs must be <= target (keto limit - can be 0, but not more than target)
-        total = 0.0
-        for i, food in enumerate(all_foods):
-            total += servings[i] * float(food.carbs_g_per_serving)
-        return target_carbs - total  # >= 0 means total <= target
-
-    def constraint_fats(servings):
-        total = 0.0
-        for i, food in enumerate(all_foods):
-            total += servings[i] * float(food.fats_g_per_serving)
-        return total - target_fats
-
-    # Initial guess: start with small servings
-    x0 = [0.5] * len(all_foods)
-
-    # Bounds: servings must be >= 0
-    bounds = [(0, None)] * len(all_foods)
-
-    # Constraints
-    # Protein and fats must be exact (eq), carbs must be <= target (keto limit)
-    constraints = [
-        {"type": "eq", "fun": constraint_protein},
-        {"type": "ineq", "fun": constraint_carbs_max},  # total_carbs <= target_carbs (keto limit)
-        {"type": "eq", "fun": constraint_fats},
+    # Servings can't be negative, so a target already passed at breakfast and lunch
+    # can't be met; say so instead of handing the solver an infeasible problem.
+    # Float rounding in the consumed sums (0.1 + 0.2 > 0.3) gets the same slack
+    # as the solver's exactness check
+    exceeded = [
+        name
+        for name, target in (("protein", target_protein), ("carbs", target_carbs), ("fats", target_fats))
+        if target < -1e-6
     ]
+    if exceeded:
+        return ServingsResponse({"error": f"Breakfast and lunch already exceed the daily {', '.join(exceeded)} target."})
+    target_protein, target_carbs, target_fats = (max(target, 0.0) for target in (target_protein, target_carbs, target_fats))
+
+    # Macro matrix (protein, carbs, fats per serving), one row per food
+    macros = macro_matrix(all_foods)
+
+    # Identical problems (same foods' macros and remaining targets) come up a lot
+    # while a user tweaks their selection, so remember solutions between requests.
+    # The solve only depends on the macros and targets, so people share entries
+    problem = macros.tobytes() + repr((target_protein, target_carbs, target_fats)).encode()
+    solution_cache_key = f"calculate_servings:{hashlib.sha1(problem).hexdigest()}"
 
     # Solve
     try:
-        result = minimize(
-            objective,
-            x0,
-            method="SLSQP",
-            bounds=bounds,
-            constraints=constraints,
-            options={"maxiter": 1000},
-        )
-
-        if not result.success:
-            return JsonResponse({"error": f"Optimization failed: {result.message}"})
+        solution = cache.get(solution_cache_key)
+        if solution is None:
+            try:
+                solution = solve_dinner(
+                    macros,
+                    [protein_powder_idx, heavy_cream_idx],
+                    target_protein,
+                    target_carbs,
+                    target_fats,
+                ).tolist()
+            except OptimizationError as e:
+                return ServingsResponse({"error": f"Optimization failed: {e}"})
+            cache.set(solution_cache_key, solution, SOLUTION_CACHE_TIMEOUT)
 
         # Format results with macro calculations
         results = {
@@ -222,137 +331,60 @@ def calculate_servings(request, person_name):
             "dinner": [],
             "supplements": [],
             "daily_totals": {"protein": 0.0, "carbs": 0.0, "fats": 0.0},
-            "daily_goals": {"protein": float(person.protein_grams), "carbs": float(person.carbs_grams), "fats": float(person.fats_grams)},
+            "daily_goals": {"protein": goal_protein, "carbs": goal_carbs, "fats": goal_fats},
         }
 
-        # Calculate breakfast totals (user-set servings)
-        breakfast_total = [0.0, 0.0, 0.0]
-        for food, servings in breakfast_foods_servings:
-            protein = float(servings) * float(food.protein_g_per_serving)
-            carbs = float(servings) * float(food.carbs_g_per_serving)
-            fats = float(servings) * float(food.fats_g_per_serving)
-            
-            breakfast_total[0] += protein
-            breakfast_total[1] += carbs
-            breakfast_total[2] += fats
-            
-            results["breakfast"].append({
-                "food_id": food.id,
-                "food_name": food.name,
-                "servings": float(servings),
-                "serving_name": food.serving_name or "serving",
-                "protein": protein,
-                "carbs": carbs,
-                "fats": fats,
-            })
-
-        # Calculate lunch totals (user-set servings)
-        lunch_total = [0.0, 0.0, 0.0]
-        for food, servings in lunch_foods_servings:
-            protein = float(servings) * float(food.protein_g_per_serving)
-            carbs = float(servings) * float(food.carbs_g_per_serving)
-            fats = float(servings) * float(food.fats_g_per_serving)
-            
-            lunch_total[0] += protein
-            lunch_total[1] += carbs
-            lunch_total[2] += fats
-            
-            results["lunch"].append({
-                "food_id": food.id,
-                "food_name": food.name,
-                "servings": float(servings),
-                "serving_name": food.serving_name or "serving",
-                "protein": protein,
-                "carbs": carbs,
-                "fats": fats,
-            })
-
-        # Calculate dinner totals (calculated servings)
-        dinner_total = [0.0, 0.0, 0.0]
-        for idx in dinner_indices:
-            servings = result.x[idx]
-            if servings > 0.001:  # Only show if significant
-                food = all_foods[idx]
-                protein = float(servings) * float(food.protein_g_per_serving)
-                carbs = float(servings) * float(food.carbs_g_per_serving)
-                fats = float(servings) * float(food.fats_g_per_serving)
-                
-                dinner_total[0] += protein
-                dinner_total[1] += carbs
-                dinner_total[2] += fats
-                
-                results["dinner"].append({
-                    "food_id": food.id,
-                    "food_name": food.name,
-                    "servings": float(servings),
-                    "serving_name": food.serving_name or "serving",
+        # Breakfast and lunch rows come straight from the arrays built above
+        logged_rows = logged_contributions.tolist()
+        results["breakfast"] = format_meal(breakfast_foods_servings, logged_rows[:len(breakfast_foods_servings)])
+        results["lunch"] = format_meal(lunch_foods_servings, logged_rows[len(breakfast_foods_servings):])
+        breakfast_total, lunch_total = logged_totals.tolist()
+
+        # Per-food macros of the solved servings, reusing the float matrix from the solve
+        dinner_rows = contributions(solution, macros).tolist()
+
+        # Only show dinner foods and supplements with significant servings
+        dinner_picks = [idx for idx in dinner_indices if solution[idx] > 0.001]
+        results["dinner"] = format_meal(
+            [(all_foods[idx], solution[idx]) for idx in dinner_picks],
+            [dinner_rows[idx] for idx in dinner_picks],
+        )
+
+        # Add supplements to dinner only (if needed)
+        for name, supplement, idx in (
+            ("Protein Powder", protein_powder, protein_powder_idx),
+            ("Heavy Cream", heavy_cream, heavy_cream_idx),
+        ):
+            if solution[idx] > 0.001:
+                dinner_picks.append(idx)
+                protein, carbs, fats = dinner_rows[idx]
+                results["supplements"].append({
+                    "name": name,
+                    "servings": solution[idx],
+                    "serving_name": supplement.serving_name or "serving",
                     "protein": protein,
                     "carbs": carbs,
                     "fats": fats,
                 })
 
-        # Add supplements to dinner only (if needed)
-        protein_powder_servings = result.x[protein_powder_idx]
-        heavy_cream_servings = result.x[heavy_cream_idx]
-
-        if protein_powder_servings > 0.001:
-            protein_pp = float(protein_powder_servings) * float(protein_powder.protein_g_per_serving)
-            carbs_pp = float(protein_powder_servings) * float(protein_powder.carbs_g_per_serving)
-            fats_pp = float(protein_powder_servings) * float(protein_powder.fats_g_per_serving)
-            
-            dinner_total[0] += protein_pp
-            dinner_total[1] += carbs_pp
-            dinner_total[2] += fats_pp
-            
-            results["supplements"].append({
-                "name": "Protein Powder",
-                "servings": float(protein_powder_servings),
-                "serving_name": protein_powder.serving_name or "serving",
-                "protein": protein_pp,
-                "carbs": carbs_pp,
-                "fats": fats_pp,
-            })
-
-        if heavy_cream_servings > 0.001:
-            protein_hc = float(heavy_cream_servings) * float(heavy_cream.protein_g_per_serving)
-            carbs_hc = float(heavy_cream_servings) * float(heavy_cream.carbs_g_per_serving)
-            fats_hc = float(heavy_cream_servings) * float(heavy_cream.fats_g_per_serving)
-            
-            dinner_total[0] += protein_hc
-            dinner_total[1] += carbs_hc
-            dinner_total[2] += fats_hc
-            
-            results["supplements"].append({
-                "name": "Heavy Cream",
-                "servings": float(heavy_cream_servings),
-                "serving_name": heavy_cream.serving_name or "serving",
-                "protein": protein_hc,
-                "carbs": carbs_hc,
-                "fats": fats_hc,
-            })
-
-        # Add meal totals and goals to results
+        # Dinner totals (calculated servings, supplements included)
+        dinner_total = [sum((dinner_rows[idx][i] for idx in dinner_picks), 0.0) for i in range(3)]
+
+        # Add meal totals and goals to results; breakfast and lunch each aim for a third of the day
+        meal_goal = {"protein": goal_protein / 3.0, "carbs": goal_carbs / 3.0, "fats": goal_fats / 3.0}
         results["breakfast_total"] = {
             "protein": breakfast_total[0],
             "carbs": breakfast_total[1],
             "fats": breakfast_total[2],
         }
-        results["breakfast_goal"] = {
-            "protein": float(person.protein_grams) / 3.0,
-            "carbs": float(person.carbs_grams) / 3.0,
-            "fats": float(person.fats_grams) / 3.0,
-        }
+        results["breakfast_goal"] = meal_goal
         
         results["lunch_total"] = {
             "protein": lunch_total[0],
             "carbs": lunch_total[1],
             "fats": lunch_total[2],
         }
-        results["lunch_goal"] = {
-            "protein": float(person.protein_grams) / 3.0,
-            "carbs": float(person.carbs_grams) / 3.0,
-            "fats": float(person.fats_grams) / 3.0,
-        }
+        results["lunch_goal"] = meal_goal
         
         results["dinner_total"] = {
             "protein": dinner_total[0],
@@ -370,9 +402,9 @@ def calculate_servings(request, person_name):
         results["daily_totals"]["carbs"] = breakfast_total[1] + lunch_total[1] + dinner_total[1]
         results["daily_totals"]["fats"] = breakfast_total[2] + lunch_total[2] + dinner_total[2]
 
-        return JsonResponse(results)
+        return ServingsResponse(results)
 
     except Exception as e:
-        return JsonResponse({"error": f"Calculation error: {str(e)}"})
+        return ServingsResponse({"error": f"Calculation error: {str(e)}"})
 
 
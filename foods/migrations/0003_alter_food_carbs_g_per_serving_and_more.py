@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-14 03:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foods', '0002_remove_food_calories_per_serving_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='food',
+            name='carbs_g_per_serving',
+            field=models.FloatField(help_text='Carbohydrates (g) per serving.'),
+        ),
+        migrations.AlterField(
+            model_name='food',
+            name='fats_g_per_serving',
+            field=models.FloatField(help_text='Fat (g) per serving.'),
+        ),
+        migrations.AlterField(
+            model_name='food',
+            name='protein_g_per_serving',
+            field=models.FloatField(help_text='Protein (g) per serving.'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 03:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foods', '0003_alter_food_carbs_g_per_serving_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['is_active', 'name'], name='foods_food_is_acti_82333a_idx'),
+        ),
+    ]
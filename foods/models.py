@@ -29,19 +29,15 @@ class Food(models.Model):
 
     # Macro information per *serving*
     # (a serving can be whatever makes sense: 1 slice, 1 cup, 1 cookie, etc.)
-    protein_g_per_serving = models.DecimalField(
-        max_digits=6,
-        decimal_places=1,
+    # Stored as floats: they feed straight into the servings optimizer, and
+    # nutrition labels are nowhere near float precision.
+    protein_g_per_serving = models.FloatField(
         help_text="Protein (g) per serving.",
     )
-    carbs_g_per_serving = models.DecimalField(
-        max_digits=6,
-        decimal_places=1,
+    carbs_g_per_serving = models.FloatField(
         help_text="Carbohydrates (g) per serving.",
     )
-    fats_g_per_serving = models.DecimalField(
-        max_digits=6,
-        decimal_places=1,
+    fats_g_per_serving = models.FloatField(
         help_text="Fat (g) per serving.",
     )
 
@@ -67,6 +63,8 @@ class Food(models.Model):
 
     class Meta:
         ordering = ["name"]
+        # Serves the meal_log picker: filter(is_active=True).order_by("name")
+        indexes = [models.Index(fields=["is_active", "name"])]
 
     def __str__(self) -> str:
         return self.name